@@ -1,13 +1,15 @@
 import dash
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, ClientsideFunction, Patch, DiskcacheManager
 import plotly.graph_objs as go
 import dash_bootstrap_components as dbc
-from rag_model import get_rag_response, analyze_maize_image
+from rag_model import get_rag_response, analyze_maize_image_bytes
 import pandas as pd
-from datetime import datetime, timedelta
-from PIL import Image
 import base64
-from io import BytesIO
+import diskcache
+import functools
+import hashlib
+import os
+from types import MappingProxyType
 
 #createdashapp
 app = dash.Dash(
@@ -18,60 +20,53 @@ app = dash.Dash(
     ]
 )
 
+#backgroundcallbacks
+background_callback_manager = DiskcacheManager(
+    diskcache.Cache(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'callbacks'))
+)
+
 #datastructures
-class FarmData:
-    @staticmethod
-    def generate_time_series(days=30):
-        dates = [(datetime.now() - timedelta(days=x)).strftime('%Y-%m-%d') for x in range(days)]
-        return pd.DataFrame({'date': dates})
-
-    @staticmethod
-    def get_inventory_data():
-        return {
-            "crops": [
-                {"name": "Maize", "quantity": 150, "unit": "kg", "status": "optimal"}
-            ],
-            "resources": [
-                {"name": "Water", "level": 85, "unit": "%"},
-                {"name": "Nutrients", "level": 72, "unit": "%"},
-                {"name": "Growing Medium", "level": 90, "unit": "%"}
-            ]
-        }
-
-    @staticmethod
-    def get_plant_health_data():
-        return {
-            "current_metrics": [
-                {"plant": "Maize", "health": 92, "pH": 6.2, "humidity": 65, "temperature": 23.5}
-            ],
-            "optimal_ranges": {
-                "pH": {"min": 5.5, "max": 6.5},
-                "humidity": {"min": 60, "max": 75},
-                "temperature": {"min": 20, "max": 26}
-            }
-        }
-
-    @staticmethod
-    def get_system_status():
-        return {
-            "components": [
-                {"name": "Irrigation System", "status": "operational", "efficiency": 95},
-                {"name": "Climate Control", "status": "operational", "efficiency": 88},
-                {"name": "Soil Monitoring", "status": "operational", "efficiency": 94},
-                {"name": "Nutrient Delivery", "status": "maintenance_required", "efficiency": 82}
-            ],
-            "alerts": [
-                {"type": "info", "message": "Maize growth rate optimal"},
-                {"type": "warning", "message": "Nutrient levels need adjustment in 24 hours"},
-                {"type": "info", "message": "Soil moisture at recommended levels"}
-            ]
-        }
+def generate_time_series(days=30):
+    #newest first, same order as before
+    dates = pd.date_range(end=pd.Timestamp.now().normalize(), periods=days, freq='D')[::-1]
+    return pd.DataFrame({'date': dates.strftime('%Y-%m-%d')})
+
+#farmdata (read-only, built once at import)
+INVENTORY = MappingProxyType({
+    "crops": (
+        MappingProxyType({"name": "Maize", "quantity": 150, "unit": "kg", "status": "optimal"}),
+    ),
+    "resources": (
+        MappingProxyType({"name": "Water", "level": 85, "unit": "%"}),
+        MappingProxyType({"name": "Nutrients", "level": 72, "unit": "%"}),
+        MappingProxyType({"name": "Growing Medium", "level": 90, "unit": "%"})
+    )
+})
 
-#initdata
-farm_data = FarmData()
-inventory = farm_data.get_inventory_data()
-plant_health = farm_data.get_plant_health_data()
-system_status = farm_data.get_system_status()
+PLANT_HEALTH = MappingProxyType({
+    "current_metrics": (
+        MappingProxyType({"plant": "Maize", "health": 92, "pH": 6.2, "humidity": 65, "temperature": 23.5}),
+    ),
+    "optimal_ranges": MappingProxyType({
+        "pH": MappingProxyType({"min": 5.5, "max": 6.5}),
+        "humidity": MappingProxyType({"min": 60, "max": 75}),
+        "temperature": MappingProxyType({"min": 20, "max": 26})
+    })
+})
+
+SYSTEM_STATUS = MappingProxyType({
+    "components": (
+        MappingProxyType({"name": "Irrigation System", "status": "operational", "efficiency": 95}),
+        MappingProxyType({"name": "Climate Control", "status": "operational", "efficiency": 88}),
+        MappingProxyType({"name": "Soil Monitoring", "status": "operational", "efficiency": 94}),
+        MappingProxyType({"name": "Nutrient Delivery", "status": "maintenance_required", "efficiency": 82})
+    ),
+    "alerts": (
+        MappingProxyType({"type": "info", "message": "Maize growth rate optimal"}),
+        MappingProxyType({"type": "warning", "message": "Nutrient levels need adjustment in 24 hours"}),
+        MappingProxyType({"type": "info", "message": "Soil moisture at recommended levels"})
+    )
+})
 
 #styling
 CUSTOM_STYLE = {
@@ -82,27 +77,178 @@ CUSTOM_STYLE = {
     'font-family': 'Orbitron, sans-serif'
 }
 
+#shared style dicts, built once and reused by every render
+_ALERT_COLORS = {
+    'critical': '#ff0000',
+    'warning': '#ffae00',
+    'info': '#00ff9d'
+}
+_STATUS_COLORS = {
+    'operational': '#00ff9d',
+    'maintenance_required': '#ffae00',
+    'critical': '#ff0000'
+}
+_CROP_STATUS_COLORS = {
+    'optimal': '#00ff9d',
+    'low': '#ffae00',
+    'critical': '#ff0000'
+}
+_HEALTH_STATUS_COLORS = {
+    'Healthy': '#00ff9d',
+    'Spotted': '#ffae00',
+    'Blighted': '#ff0000'
+}
+
+_TEXT_STYLE = {'color': CUSTOM_STYLE['text']}
+_ACCENT_STYLE = {'color': CUSTOM_STYLE['accent']}
+_ACCENT_BOLD_STYLE = {'color': CUSTOM_STYLE['accent'], 'fontWeight': 'bold'}
+_ERROR_STYLE = {'color': '#ff0000'}
+_MESSAGE_STYLE = {'marginBottom': '10px'}
+_CENTERED_STYLE = {'textAlign': 'center'}
+_CARD_STYLE = {'backgroundColor': CUSTOM_STYLE['card'], 'padding': '15px'}
+_ACCENT_HEADER_STYLE = {'backgroundColor': CUSTOM_STYLE['accent'], 'color': CUSTOM_STYLE['background']}
+
+_ALERT_DOT_STYLES = {
+    alert_type: {
+        'color': color,
+        'marginRight': '10px',
+        'display': 'inline-block',
+        'animation': 'pulse 2s infinite' if alert_type == 'critical' else 'none'
+    }
+    for alert_type, color in _ALERT_COLORS.items()
+}
+_EFFICIENCY_STYLES = {
+    status: {'color': color, 'fontSize': '1.5rem', 'fontWeight': 'bold'}
+    for status, color in _STATUS_COLORS.items()
+}
+_CROP_STATUS_STYLES = {
+    status: {'color': color, 'fontWeight': 'bold'}
+    for status, color in _CROP_STATUS_COLORS.items()
+}
+_UNKNOWN_CROP_STATUS_STYLE = {'color': '#ffffff', 'fontWeight': 'bold'}
+_HEALTH_STATUS_STYLES = {
+    status: {'color': color, 'fontWeight': 'bold'}
+    for status, color in _HEALTH_STATUS_COLORS.items()
+}
+_COMPONENT_NAME_STYLE = {'color': CUSTOM_STYLE['text'], 'fontSize': '1rem', 'marginBottom': '10px'}
+_EFFICIENCY_LABEL_STYLE = {'color': CUSTOM_STYLE['text'], 'fontSize': '0.8rem'}
+_ALERTS_HEADING_STYLE = {'color': CUSTOM_STYLE['accent'], 'marginBottom': '15px'}
+
+_TABLE_HEADER_ROW_STYLE = {'borderBottom': f'2px solid {CUSTOM_STYLE["accent"]}'}
+_TABLE_STYLE = {
+    'width': '100%',
+    'color': CUSTOM_STYLE['text'],
+    'borderCollapse': 'collapse'
+}
+
+_GAUGE_STYLE = {
+    'width': '100%',
+    'padding': '5px'
+}
+_GAUGE_FRAME_STYLE = {
+    'position': 'relative',
+    'width': '80%',
+    'paddingBottom': '80%',
+    'margin': '0 auto',
+}
+_GAUGE_RING_STYLE = {
+    'position': 'absolute',
+    'top': '0',
+    'left': '0',
+    'right': '0',
+    'bottom': '0',
+    'borderRadius': '50%',
+    'display': 'flex',
+    'alignItems': 'center',
+    'justifyContent': 'center'
+}
+_GAUGE_CENTER_STYLE = {
+    'background': CUSTOM_STYLE['card'],
+    'borderRadius': '50%',
+    'width': '70%',
+    'height': '70%',
+    'display': 'flex',
+    'alignItems': 'center',
+    'justifyContent': 'center',
+    'fontSize': 'clamp(0.8rem, 2vw, 1.2rem)',
+    'fontWeight': 'bold'
+}
+_GAUGE_LABEL_STYLE = {
+    'textAlign': 'center',
+    'marginTop': '5px',
+    'color': CUSTOM_STYLE['text'],
+    'fontSize': 'clamp(0.7rem, 1.5vw, 0.9rem)',
+    'whiteSpace': 'nowrap',
+    'overflow': 'hidden',
+    'textOverflow': 'ellipsis'
+}
+
+_HEALTH_GAUGE_RING_STYLE = {
+    'position': 'relative',
+    'width': '100px',
+    'height': '100px',
+    'margin': '0 auto',
+    'borderRadius': '50%',
+    'display': 'flex',
+    'alignItems': 'center',
+    'justifyContent': 'center'
+}
+_HEALTH_GAUGE_CENTER_STYLE = {**_GAUGE_CENTER_STYLE, 'fontSize': '1.2rem'}
+_HEALTH_GAUGE_LABEL_STYLE = {
+    'textAlign': 'center',
+    'marginTop': '5px',
+    'color': CUSTOM_STYLE['text'],
+    'fontSize': '0.9rem'
+}
+
+_PILL_STYLE = {
+    'textAlign': 'center',
+    'backgroundColor': '#1E1E1E',
+    'padding': '8px',
+    'borderRadius': '5px',
+    'height': '100%'
+}
+_PILL_LABEL_STYLE = {
+    'color': CUSTOM_STYLE['accent'],
+    'fontSize': '0.8rem',
+    'marginBottom': '2px'
+}
+_PILL_VALUE_STYLE = {
+    'color': CUSTOM_STYLE['text'],
+    'fontSize': '1.1rem',
+    'fontWeight': 'bold'
+}
+_PILL_RANGE_STYLE = {
+    'color': '#888',
+    'fontSize': '0.7rem'
+}
+
+_PANEL_BODY_STYLE = {
+    'padding': '10px',
+    'height': '250px',
+    'overflowY': 'auto'
+}
+_PANEL_CARD_STYLE = {
+    'backgroundColor': CUSTOM_STYLE['card'],
+    'height': '100%'
+}
+
+_ANALYSIS_STYLE = {
+    'backgroundColor': '#1E1E1E',
+    'padding': '15px',
+    'borderRadius': '8px',
+    'marginTop': '10px',
+    'color': CUSTOM_STYLE['text'],
+    'fontSize': '0.9rem',
+    'lineHeight': '1.5'
+}
+
 def create_alert_item(alert):
     #createalert
-    colors = {
-        'critical': '#ff0000',
-        'warning': '#ffae00',
-        'info': '#00ff9d'
-    }
-    
     return html.Div([
-        html.Div(
-            "●", 
-            style={
-                'color': colors[alert['type']],
-                'marginRight': '10px',
-                'display': 'inline-block',
-                'animation': 'pulse 2s infinite' if alert['type'] == 'critical' else 'none'
-            }
-        ),
-        html.Span(alert['message'], 
-                 style={'color': CUSTOM_STYLE['text']})
-    ], style={'marginBottom': '10px'})
+        html.Div("●", style=_ALERT_DOT_STYLES[alert['type']]),
+        html.Span(alert['message'], style=_TEXT_STYLE)
+    ], style=_MESSAGE_STYLE)
 
 def create_system_status_indicators(status_data):
     #createstatus
@@ -110,24 +256,16 @@ def create_system_status_indicators(status_data):
     
     #systemstatus
     for comp in status_data['components']:
-        color = {
-            'operational': '#00ff9d',
-            'maintenance_required': '#ffae00',
-            'critical': '#ff0000'
-        }.get(comp['status'], '#ff0000')
-        
         components.append(
             dbc.Col(
                 dbc.Card([
-                    html.H4(comp['name'], 
-                           style={'color': CUSTOM_STYLE['text'], 'fontSize': '1rem', 'marginBottom': '10px'}),
+                    html.H4(comp['name'], style=_COMPONENT_NAME_STYLE),
                     html.Div([
                         html.Div(f"{comp['efficiency']}%", 
-                                style={'color': color, 'fontSize': '1.5rem', 'fontWeight': 'bold'}),
-                        html.Div("Efficiency", 
-                                style={'color': CUSTOM_STYLE['text'], 'fontSize': '0.8rem'})
-                    ], style={'textAlign': 'center'})
-                ], style={'backgroundColor': CUSTOM_STYLE['card'], 'padding': '15px'})
+                                style=_EFFICIENCY_STYLES.get(comp['status'], _EFFICIENCY_STYLES['critical'])),
+                        html.Div("Efficiency", style=_EFFICIENCY_LABEL_STYLE)
+                    ], style=_CENTERED_STYLE)
+                ], style=_CARD_STYLE)
             )
         )
     
@@ -136,10 +274,9 @@ def create_system_status_indicators(status_data):
         dbc.Row(
             dbc.Col(
                 dbc.Card([
-                    html.H4("ACTIVE ALERTS", 
-                           style={'color': CUSTOM_STYLE['accent'], 'marginBottom': '15px'}),
+                    html.H4("ACTIVE ALERTS", style=_ALERTS_HEADING_STYLE),
                     html.Div([create_alert_item(alert) for alert in status_data['alerts']])
-                ], style={'backgroundColor': CUSTOM_STYLE['card'], 'padding': '15px'})
+                ], style=_CARD_STYLE)
             )
         )
     ])
@@ -148,29 +285,18 @@ def create_inventory_table(crops_data):
     #createtable
     return html.Div([
         html.Table(
-            [html.Tr([html.Th(col, style={'color': CUSTOM_STYLE['accent']}) 
+            [html.Tr([html.Th(col, style=_ACCENT_STYLE) 
                      for col in ['Crop', 'Quantity', 'Status']],
-                    style={'borderBottom': f'2px solid {CUSTOM_STYLE["accent"]}'})] +
+                    style=_TABLE_HEADER_ROW_STYLE)] +
             [html.Tr([
                 html.Td(crop['name']),
                 html.Td(f"{crop['quantity']} {crop['unit']}"),
                 html.Td(html.Div(
                     crop['status'].upper(),
-                    style={
-                        'color': {
-                            'optimal': '#00ff9d',
-                            'low': '#ffae00',
-                            'critical': '#ff0000'
-                        }.get(crop['status'], '#ffffff'),
-                        'fontWeight': 'bold'
-                    }
+                    style=_CROP_STATUS_STYLES.get(crop['status'], _UNKNOWN_CROP_STATUS_STYLE)
                 ))
             ]) for crop in crops_data]
-        , style={
-            'width': '100%',
-            'color': CUSTOM_STYLE['text'],
-            'borderCollapse': 'collapse'
-        })
+        , style=_TABLE_STYLE)
     ])
 
 def create_resource_gauges(resources_data):
@@ -184,92 +310,26 @@ def create_resource_gauges(resources_data):
         ])
     ])
 
+#cached trees are shared between callers, treat them as read-only
+@functools.lru_cache(maxsize=128)
 def create_gauge(name, level, unit):
     #createsinglegauge
     color = '#00ff9d' if level > 70 else '#ffae00' if level > 30 else '#ff0000'
     
     return html.Div([
         html.Div(
-            style={
-                'position': 'relative',
-                'width': '80%',
-                'paddingBottom': '80%',
-                'margin': '0 auto',
-            },
+            style=_GAUGE_FRAME_STYLE,
             children=[
                 html.Div(
-                    style={
-                        'position': 'absolute',
-                        'top': '0',
-                        'left': '0',
-                        'right': '0',
-                        'bottom': '0',
-                        'background': f'conic-gradient({color} {level}%, #333 0)',
-                        'borderRadius': '50%',
-                        'display': 'flex',
-                        'alignItems': 'center',
-                        'justifyContent': 'center'
-                    },
+                    style={**_GAUGE_RING_STYLE, 'background': f'conic-gradient({color} {level}%, #333 0)'},
                     children=[
-                        html.Div(
-                            f"{level}{unit}",
-                            style={
-                                'background': CUSTOM_STYLE['card'],
-                                'borderRadius': '50%',
-                                'width': '70%',
-                                'height': '70%',
-                                'display': 'flex',
-                                'alignItems': 'center',
-                                'justifyContent': 'center',
-                                'color': color,
-                                'fontSize': 'clamp(0.8rem, 2vw, 1.2rem)',
-                                'fontWeight': 'bold'
-                            }
-                        )
+                        html.Div(f"{level}{unit}", style={**_GAUGE_CENTER_STYLE, 'color': color})
                     ]
                 )
             ]
         ),
-        html.Div(name, style={
-            'textAlign': 'center',
-            'marginTop': '5px',
-            'color': CUSTOM_STYLE['text'],
-            'fontSize': 'clamp(0.7rem, 1.5vw, 0.9rem)',
-            'whiteSpace': 'nowrap',
-            'overflow': 'hidden',
-            'textOverflow': 'ellipsis'
-        })
-    ], style={
-        'width': '100%',
-        'padding': '5px'
-    })
-
-def create_chat_interface():
-    #createchatui
-    return html.Div([
-        dcc.Upload(
-            id='upload-image',
-            children=html.Div([
-                'Drag and Drop or ',
-                html.A('Select Image', style={'color': CUSTOM_STYLE['accent']})
-            ]),
-            style={
-                'width': '100%',
-                'height': '60px',
-                'lineHeight': '60px',
-                'borderWidth': '1px',
-                'borderStyle': 'dashed',
-                'borderRadius': '5px',
-                'textAlign': 'center',
-                'margin': '10px 0',
-                'color': CUSTOM_STYLE['text'],
-                'borderColor': CUSTOM_STYLE['accent'],
-                'cursor': 'pointer'
-            },
-            multiple=False
-        ),
-        html.Div(id='output-image-upload')
-    ])
+        html.Div(name, style=_GAUGE_LABEL_STYLE)
+    ], style=_GAUGE_STYLE)
 
 def create_health_metrics(health_data):
     #createhealthmetrics
@@ -282,7 +342,7 @@ def create_health_metrics(health_data):
             dbc.Col(
                 create_health_gauge(metric['health'], "Overall Health"),
                 width=12,
-                style={'marginBottom': '10px'}
+                style=_MESSAGE_STYLE
             )
         ]),
         #additionalmetrics
@@ -302,76 +362,32 @@ def create_health_metrics(health_data):
         ])
     ])
 
+#cached trees are shared between callers, treat them as read-only
+@functools.lru_cache(maxsize=128)
 def create_health_gauge(value, title):
     #createhealthgauge
     color = '#00ff9d' if value > 80 else '#ffae00' if value > 60 else '#ff0000'
     
     return html.Div([
         html.Div(
-            style={
-                'position': 'relative',
-                'width': '100px',
-                'height': '100px',
-                'margin': '0 auto',
-                'background': f'conic-gradient({color} {value}%, #333 0)',
-                'borderRadius': '50%',
-                'display': 'flex',
-                'alignItems': 'center',
-                'justifyContent': 'center'
-            },
+            style={**_HEALTH_GAUGE_RING_STYLE, 'background': f'conic-gradient({color} {value}%, #333 0)'},
             children=[
-                html.Div(
-                    f"{value}%",
-                    style={
-                        'background': CUSTOM_STYLE['card'],
-                        'borderRadius': '50%',
-                        'width': '70%',
-                        'height': '70%',
-                        'display': 'flex',
-                        'alignItems': 'center',
-                        'justifyContent': 'center',
-                        'color': color,
-                        'fontSize': '1.2rem',
-                        'fontWeight': 'bold'
-                    }
-                )
+                html.Div(f"{value}%", style={**_HEALTH_GAUGE_CENTER_STYLE, 'color': color})
             ]
         ),
-        html.Div(title, style={
-            'textAlign': 'center',
-            'marginTop': '5px',
-            'color': CUSTOM_STYLE['text'],
-            'fontSize': '0.9rem'
-        })
+        html.Div(title, style=_HEALTH_GAUGE_LABEL_STYLE)
     ])
 
 def create_metric_pill(label, value, optimal_range):
     #createpill
     return html.Div([
-        html.Div(label, style={
-            'color': CUSTOM_STYLE['accent'],
-            'fontSize': '0.8rem',
-            'marginBottom': '2px'
-        }),
-        html.Div(f"{value}", style={
-            'color': CUSTOM_STYLE['text'],
-            'fontSize': '1.1rem',
-            'fontWeight': 'bold'
-        }),
-        html.Div(f"Range: {optimal_range}", style={
-            'color': '#888',
-            'fontSize': '0.7rem'
-        })
-    ], style={
-        'textAlign': 'center',
-        'backgroundColor': '#1E1E1E',
-        'padding': '8px',
-        'borderRadius': '5px',
-        'height': '100%'
-    })
+        html.Div(label, style=_PILL_LABEL_STYLE),
+        html.Div(f"{value}", style=_PILL_VALUE_STYLE),
+        html.Div(f"Range: {optimal_range}", style=_PILL_RANGE_STYLE)
+    ], style=_PILL_STYLE)
 
-#mainlayout
-app.layout = html.Div(style={
+#mainlayout (built once at import)
+_LAYOUT = html.Div(style={
     'backgroundColor': CUSTOM_STYLE['background'],
     'minHeight': '100vh',
     'padding': '15px',
@@ -397,10 +413,9 @@ app.layout = html.Div(style={
                 dbc.Col(
                     dbc.Card([
                         dbc.CardHeader("MAIZE CULTIVATION STATUS", 
-                                   style={'backgroundColor': CUSTOM_STYLE['accent'],
-                                         'color': CUSTOM_STYLE['background']}),
+                                   style=_ACCENT_HEADER_STYLE),
                         dbc.CardBody(
-                            [create_system_status_indicators(system_status)]
+                            [create_system_status_indicators(SYSTEM_STATUS)]
                         )
                     ], style={'backgroundColor': CUSTOM_STYLE['card']}),
                     width=12
@@ -413,57 +428,33 @@ app.layout = html.Div(style={
                 dbc.Col([
                     dbc.Card([
                         dbc.CardHeader("MAIZE HEALTH", 
-                                   style={'backgroundColor': CUSTOM_STYLE['accent'],
-                                         'color': CUSTOM_STYLE['background']}),
+                                   style=_ACCENT_HEADER_STYLE),
                         dbc.CardBody([
-                            create_health_metrics(plant_health)
-                        ], style={
-                            'padding': '10px',
-                            'height': '250px',  # Increased from 220px to 250px
-                            'overflowY': 'auto'
-                        })
-                    ], style={
-                        'backgroundColor': CUSTOM_STYLE['card'],
-                        'height': '100%'
-                    })
+                            create_health_metrics(PLANT_HEALTH)
+                        ], style=_PANEL_BODY_STYLE)
+                    ], style=_PANEL_CARD_STYLE)
                 ], width=4),
                 
                 # Resource Levels
                 dbc.Col([
                     dbc.Card([
                         dbc.CardHeader("RESOURCES", 
-                                   style={'backgroundColor': CUSTOM_STYLE['accent'],
-                                         'color': CUSTOM_STYLE['background']}),
+                                   style=_ACCENT_HEADER_STYLE),
                         dbc.CardBody([
-                            create_resource_gauges(inventory['resources'])
-                        ], style={
-                            'padding': '10px',
-                            'height': '250px',  # Increased from 220px to 250px
-                            'overflowY': 'auto'
-                        })
-                    ], style={
-                        'backgroundColor': CUSTOM_STYLE['card'],
-                        'height': '100%'
-                    })
+                            create_resource_gauges(INVENTORY['resources'])
+                        ], style=_PANEL_BODY_STYLE)
+                    ], style=_PANEL_CARD_STYLE)
                 ], width=4),
                 
                 # Inventory
                 dbc.Col([
                     dbc.Card([
                         dbc.CardHeader("INVENTORY", 
-                                   style={'backgroundColor': CUSTOM_STYLE['accent'],
-                                         'color': CUSTOM_STYLE['background']}),
+                                   style=_ACCENT_HEADER_STYLE),
                         dbc.CardBody([
-                            create_inventory_table(inventory['crops'])
-                        ], style={
-                            'padding': '10px',
-                            'height': '250px',  # Increased from 220px to 250px
-                            'overflowY': 'auto'
-                        })
-                    ], style={
-                        'backgroundColor': CUSTOM_STYLE['card'],
-                        'height': '100%'
-                    })
+                            create_inventory_table(INVENTORY['crops'])
+                        ], style=_PANEL_BODY_STYLE)
+                    ], style=_PANEL_CARD_STYLE)
                 ], width=4)
             ], className="mb-4", style={'height': 'auto'})
         ], width=8, style={'paddingRight': '10px'}),
@@ -473,14 +464,13 @@ app.layout = html.Div(style={
             # Image Upload Card
             dbc.Card([
                 dbc.CardHeader("MAIZE IMAGE ANALYSIS", 
-                            style={'backgroundColor': CUSTOM_STYLE['accent'],
-                                  'color': CUSTOM_STYLE['background']}),
+                            style=_ACCENT_HEADER_STYLE),
                 dbc.CardBody([
                     dcc.Upload(
                         id='upload-image',
                         children=html.Div([
                             'Drag and Drop or ',
-                            html.A('Select Image', style={'color': CUSTOM_STYLE['accent']})
+                            html.A('Select Image', style=_ACCENT_STYLE)
                         ]),
                         style={
                             'width': '100%',
@@ -498,7 +488,21 @@ app.layout = html.Div(style={
                         },
                         multiple=False
                     ),
-                    html.Div(id='output-image-upload')
+                    html.Div([
+                        # Image preview, filled in clientside
+                        html.Img(id='image-preview', hidden=True, style={
+                            'maxWidth': '400px',
+                            'maxHeight': '400px',
+                            'marginBottom': '20px',
+                            'borderRadius': '10px',
+                            'border': f'2px solid {CUSTOM_STYLE["accent"]}',
+                            'boxShadow': '0 0 10px rgba(0,255,157,0.3)'
+                        }),
+                        html.Div(id='output-image-upload')
+                    ], style={
+                        'textAlign': 'center',
+                        'marginBottom': '20px'
+                    })
                 ], style={
                     'height': '500px',  # Increased from 300px
                     'overflowY': 'auto',
@@ -513,11 +517,14 @@ app.layout = html.Div(style={
             # Chat Interface Card
             dbc.Card([
                 dbc.CardHeader("MAIZE ASSISTANT", 
-                            style={'backgroundColor': CUSTOM_STYLE['accent'],
-                                  'color': CUSTOM_STYLE['background']}),
+                            style=_ACCENT_HEADER_STYLE),
                 dbc.CardBody([
+                    dcc.Store(id='chat-store'),
+                    #bubble styles for the clientside sender, kept in one place
+                    dcc.Store(id='chat-styles', data={'label': _ACCENT_BOLD_STYLE, 'message': _MESSAGE_STYLE}),
                     html.Div(
                         id='chat-history',
+                        children=[],
                         style={
                             'height': '300px',
                             'overflowY': 'auto',
@@ -554,10 +561,24 @@ app.layout = html.Div(style={
     ], className="g-0")
 ])
 
+app.layout = _LAYOUT
+
+#imagepreview
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='showPreview'),
+    [Output('image-preview', 'src'),
+     Output('image-preview', 'hidden')],
+    [Input('upload-image', 'contents')]
+)
+
 #imagecallback
 @app.callback(
     Output('output-image-upload', 'children'),
-    [Input('upload-image', 'contents')]
+    [Input('upload-image', 'contents')],
+    background=True,
+    manager=background_callback_manager,
+    running=[(Output('upload-image', 'disabled'), True, False)],
+    prevent_initial_call=True
 )
 def update_image_upload(contents):
     if contents is None:
@@ -565,122 +586,97 @@ def update_image_upload(contents):
     
     try:
         #decodeimage
-        content_type, content_string = contents.split(',')
-        decoded = base64.b64decode(content_string)
-        image = Image.open(BytesIO(decoded))
+        header, _, payload = contents.partition(',')
+        decoded = base64.b64decode(payload)
+        mime = header[len('data:'):header.index(';')]
+        image_key = hashlib.sha256(decoded).hexdigest()
         
         #getanalysis
-        analysis_result = analyze_maize_image(image)
+        analysis_result = analyze_maize_image_bytes(decoded, mime, cache_key=image_key)
         
         #formatresults
         if analysis_result['success']:
-            #statuscolor
-            status_color = {
-                'Healthy': '#00ff9d',
-                'Spotted': '#ffae00',
-                'Blighted': '#ff0000'
-            }.get(analysis_result['health_status'], CUSTOM_STYLE['accent'])
+            #statusstyle
+            status_style = _HEALTH_STATUS_STYLES.get(analysis_result['health_status'], _ACCENT_BOLD_STYLE)
             
             analysis_text = [
                 html.Div([
-                    html.Strong("Health Status: ", style={'color': CUSTOM_STYLE['accent']}),
-                    html.Span(analysis_result['health_status'], 
-                             style={'color': status_color, 'fontWeight': 'bold'})
+                    html.Strong("Health Status: ", style=_ACCENT_STYLE),
+                    html.Span(analysis_result['health_status'], style=status_style)
                 ]),
                 html.Div([
-                    html.Strong("Confidence: ", style={'color': CUSTOM_STYLE['accent']}),
+                    html.Strong("Confidence: ", style=_ACCENT_STYLE),
                     html.Span(f"{analysis_result['confidence']:.1%}")
                 ]),
                 html.Div([
-                    html.Strong("Analysis: ", style={'color': CUSTOM_STYLE['accent']}),
+                    html.Strong("Analysis: ", style=_ACCENT_STYLE),
                     html.Span(analysis_result['description'])
                 ]),
                 html.Div([
-                    html.Strong("Detected Features: ", style={'color': CUSTOM_STYLE['accent']}),
+                    html.Strong("Detected Features: ", style=_ACCENT_STYLE),
                     html.Span(", ".join(analysis_result['tags']))
                 ])
             ]
         else:
             analysis_text = [
                 html.Div([
-                    html.Strong("Error: ", style={'color': '#ff0000'}),
+                    html.Strong("Error: ", style=_ERROR_STYLE),
                     html.Span(analysis_result['error'])
                 ])
             ]
         
-        return html.Div([
-            # Image display
-            html.Img(src=contents, style={
-                'maxWidth': '400px',  # Increased from 300px
-                'maxHeight': '400px',  # Increased from 300px
-                'marginBottom': '20px',
-                'borderRadius': '10px',
-                'border': f'2px solid {CUSTOM_STYLE["accent"]}',
-                'boxShadow': '0 0 10px rgba(0,255,157,0.3)'  # Added glow effect
-            }),
-            # Analysis results
-            html.Div(analysis_text, style={
-                'backgroundColor': '#1E1E1E',
-                'padding': '15px',
-                'borderRadius': '8px',
-                'marginTop': '10px',
-                'color': CUSTOM_STYLE['text'],
-                'fontSize': '0.9rem',
-                'lineHeight': '1.5'
-            })
-        ], style={
-            'textAlign': 'center',
-            'marginBottom': '20px'
-        })
+        #analysisresults
+        return html.Div(analysis_text, style=_ANALYSIS_STYLE)
         
     except Exception as e:
         print(f"Error: {str(e)}")
         return html.Div([
-            html.Strong("Error: ", style={'color': '#ff0000'}),
+            html.Strong("Error: ", style=_ERROR_STYLE),
             html.Span(str(e))
         ])
 
-#chatcallback
-@app.callback(
-    [Output('chat-history', 'children'),
+#chatsend (user bubble is appended clientside, no server round trip)
+app.clientside_callback(
+    ClientsideFunction(namespace='ui', function_name='sendMessage'),
+    [Output('chat-history', 'children', allow_duplicate=True),
+     Output('chat-store', 'data'),
      Output('chat-input', 'value')],
     [Input('chat-button', 'n_clicks'),
      Input('chat-input', 'n_submit')],
     [State('chat-input', 'value'),
-     State('chat-history', 'children')]
+     State('chat-history', 'children'),
+     State('chat-styles', 'data')],
+    prevent_initial_call=True
+)
+
+#chatcallback
+@app.callback(
+    Output('chat-history', 'children', allow_duplicate=True),
+    [Input('chat-store', 'data')],
+    prevent_initial_call=True
 )
-def update_chat(n_clicks, n_submit, input_value, chat_history):
-    if not dash.callback_context.triggered or not input_value:
+def update_chat(pending):
+    if not pending or not pending.get('message'):
         raise dash.exceptions.PreventUpdate
     
-    if chat_history is None:
-        chat_history = []
-    
-    #addusermessage
-    chat_history.append(
-        html.Div([
-            html.Span("You: ", style={'color': CUSTOM_STYLE['accent'], 'fontWeight': 'bold'}),
-            html.Span(input_value)
-        ], style={'marginBottom': '10px'})
-    )
-    
     #getairesponse
     context = {
-        'inventory': inventory,
-        'plant_health': plant_health,
-        'system_status': system_status
+        'inventory': INVENTORY,
+        'plant_health': PLANT_HEALTH,
+        'system_status': SYSTEM_STATUS
     }
-    response = get_rag_response(input_value, context)
+    response = get_rag_response(pending['message'], context)
     
-    #addairesponse
+    #addairesponse, only the new message is sent
+    chat_history = Patch()
     chat_history.append(
         html.Div([
-            html.Span("Farm Assistant: ", style={'color': CUSTOM_STYLE['accent'], 'fontWeight': 'bold'}),
+            html.Span("Farm Assistant: ", style=_ACCENT_BOLD_STYLE),
             html.Span(response)
-        ], style={'marginBottom': '10px'})
+        ], style=_MESSAGE_STYLE)
     )
     
-    return chat_history, ''
+    return chat_history
 
 if __name__ == '__main__':
     app.run_server(debug=True)
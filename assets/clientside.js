@@ -0,0 +1,39 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ui: {
+        //show the uploaded image straight from the data uri, no server round trip
+        showPreview: function(contents) {
+            if (!contents) {
+                return [window.dash_clientside.no_update, true];
+            }
+            return [contents, false];
+        },
+
+        //append the user's bubble immediately and hand the message to the server via chat-store
+        sendMessage: function(n_clicks, n_submit, value, history, styles) {
+            if (!value) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            var bubble = {
+                type: 'Div',
+                namespace: 'dash_html_components',
+                props: {
+                    children: [
+                        {
+                            type: 'Span',
+                            namespace: 'dash_html_components',
+                            props: {children: 'You: ', style: styles.label}
+                        },
+                        {
+                            type: 'Span',
+                            namespace: 'dash_html_components',
+                            props: {children: value}
+                        }
+                    ],
+                    style: styles.message
+                }
+            };
+            //sent makes repeated identical messages still count as a change
+            return [(history || []).concat([bubble]), {message: value, sent: Date.now()}, ''];
+        }
+    }
+});
@@ -1,10 +1,15 @@
 from io import BytesIO
+from itertools import chain
+import functools
+import re
+from types import MappingProxyType
 import requests
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 import json
 import os
 from datetime import datetime
 from PIL import Image
+import diskcache
 from azure.cognitiveservices.vision.computervision import ComputerVisionClient
 from msrest.authentication import CognitiveServicesCredentials
 from config import AZURE_VISION_ENDPOINT as ENDPOINT, AZURE_VISION_KEY as API_KEY
@@ -15,90 +20,147 @@ vision_client = ComputerVisionClient(
     CognitiveServicesCredentials(API_KEY)
 )
 
-def analyze_maize_image(image: Image) -> Dict[str, Any]:
-    """
-    Analyzes maize leaf image using Azure Computer Vision and classifies health status
-    """
-    try:
-        #convert image to byte array
-        img_byte_array = BytesIO()
-        image.save(img_byte_array, format='JPEG')
-        img_byte_array.seek(0)
-        
-        #get image analysis from azure
-        analysis = vision_client.analyze_image_in_stream(
-            image=img_byte_array,
-            visual_features=['Description', 'Tags', 'Objects'],
-            language='en'
-        )
-        
-        #extract tags and description
-        tags = [tag.name.lower() for tag in analysis.tags]
-        description = analysis.description.captions[0].text if analysis.description.captions else ""
-        
-        #classify leaf health based on tags and description
+#keywords to look for in tags and description
+_SPOT = frozenset({'spot', 'spots', 'spotted', 'lesion', 'lesions', 'brown', 'yellow'})
+_BLIGHT = frozenset({'blight', 'blighted', 'wilted', 'dying', 'diseased', 'disease', 'infected'})
+
+#one alternation over every indicator, the named group is the matching category
+_INDICATOR_RE = re.compile('(?P<blighted>{})|(?P<spotted>{})'.format(
+    '|'.join(map(re.escape, sorted(_BLIGHT))),
+    '|'.join(map(re.escape, sorted(_SPOT)))
+))
+
+def _match_indicators(texts) -> set:
+    """Returns the disease categories whose keywords appear in any of the texts"""
+    labels = set()
+    for text in texts:
+        for match in _INDICATOR_RE.finditer(text):
+            labels.add(match.lastgroup)
+            if match.lastgroup == 'blighted':
+                return labels
+    return labels
+
+#analysis results keyed by sha256 hex digest of the uploaded bytes, kept on disk
+#so background callback processes share them
+_analysis_cache = diskcache.Cache(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'vision'),
+    eviction_policy='least-recently-used',
+    size_limit=64 * 2**20
+)
+
+#formats azure accepts as-is, anything else is re-encoded to jpeg
+_PASSTHROUGH_MIME_TYPES = frozenset({'image/jpeg', 'image/png', 'image/gif', 'image/bmp'})
+#azure vision 3.2 rejects images of 4MB or more, larger uploads are downscaled instead
+_MAX_PASSTHROUGH_BYTES = 4 * 1024 * 1024
+
+def _encode_jpeg(image: Image) -> BytesIO:
+    """Re-encodes a PIL image to an in-memory JPEG stream, downscaled for Azure"""
+    #convert returns a copy, so thumbnail does not touch the caller's image
+    rgb_image = image.convert('RGB')
+    rgb_image.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
+    
+    img_byte_array = BytesIO()
+    rgb_image.save(img_byte_array, format='JPEG', quality=70, optimize=False, subsampling=2)
+    img_byte_array.seek(0)
+    return img_byte_array
+
+def _analyze_stream(stream: BytesIO) -> Dict[str, Any]:
+    """Sends an image stream to Azure and classifies leaf health from the response"""
+    #get image analysis from azure
+    analysis = vision_client.analyze_image_in_stream(
+        image=stream,
+        visual_features=['Description', 'Tags', 'Objects'],
+        language='en'
+    )
+    
+    #extract tags and description
+    tags = [tag.name for tag in analysis.tags]
+    description = analysis.description.captions[0].text if analysis.description.captions else ""
+    
+    #classify leaf health based on tags and description
+    health_status = "Healthy"
+    confidence = 0.0
+    
+    #check tags and description for disease indicators
+    #lowercase lazily, the matcher stops early on a blighted hit
+    matched = _match_indicators(chain((tag.lower() for tag in tags), (description.lower(),)))
+    
+    if 'blighted' in matched:
+        health_status = "Blighted"
+        confidence = 0.99
+    elif 'spotted' in matched:
+        health_status = "Spotted"
+        confidence = 0.99
+    else:
         health_status = "Healthy"
-        confidence = 0.0
-        
-        #keywords to look for in tags and description
-        disease_indicators = {
-            'spotted': ['spot', 'spots', 'spotted', 'lesion', 'lesions', 'brown', 'yellow'],
-            'blighted': ['blight', 'blighted', 'wilted', 'dying', 'diseased', 'disease', 'infected']
-        }
-        
-        #check tags and description for disease indicators
-        text_to_check = ' '.join(tags + [description.lower()])
-        
-        if any(indicator in text_to_check for indicator in disease_indicators['blighted']):
-            health_status = "Blighted"
-            confidence = 0.99
-        elif any(indicator in text_to_check for indicator in disease_indicators['spotted']):
-            health_status = "Spotted"
-            confidence = 0.99
-        else:
-            health_status = "Healthy"
-            confidence = 0.99
-        
-        #structure the results
-        result = {
-            'success': True,
-            'health_status': health_status,
-            'confidence': confidence,
-            'description': f"Leaf appears to be {health_status.lower()}",
-            'tags': tags,
-            'raw_description': description
-        }
-        
-        return result
-            
+        confidence = 0.99
+    
+    #structure the results
+    return {
+        'success': True,
+        'health_status': health_status,
+        'confidence': confidence,
+        'description': f"Leaf appears to be {health_status.lower()}",
+        'tags': tags,
+        'raw_description': description
+    }
+
+def _cached_analysis(cache_key: Optional[str], analyze: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Runs analyze unless a result is already stored for cache_key, only successes are cached"""
+    if cache_key is not None:
+        cached = _analysis_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    try:
+        result = analyze()
     except Exception as e:
         print(f"Error analyzing image: {str(e)}")
         return {
             'success': False,
             'error': str(e)
         }
+    
+    if cache_key is not None:
+        _analysis_cache.set(cache_key, result)
+    
+    return result
+
+def analyze_maize_image(image: Image, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyzes maize leaf image using Azure Computer Vision and classifies health status.
+    When cache_key is given, repeated uploads of the same image skip the Azure call.
+    """
+    return _cached_analysis(cache_key, lambda: _analyze_stream(_encode_jpeg(image)))
+
+def analyze_maize_image_bytes(data: bytes, mime: str, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Analyzes raw uploaded image bytes. JPEG/PNG/GIF/BMP under the Azure size limit are
+    sent unchanged, anything else is decoded with PIL and re-encoded to JPEG first.
+    """
+    if mime in _PASSTHROUGH_MIME_TYPES and len(data) < _MAX_PASSTHROUGH_BYTES:
+        return _cached_analysis(cache_key, lambda: _analyze_stream(BytesIO(data)))
+    return _cached_analysis(cache_key, lambda: _analyze_stream(_encode_jpeg(Image.open(BytesIO(data)))))
+
+#canned chat responses keyed by the topic keyword
+_RESPONSES = MappingProxyType({
+    "health": "The maize crop is showing good health metrics with optimal pH and humidity levels.",
+    "water": "Current water levels are at 85%, which is within the optimal range for maize growth.",
+    "nutrients": "Nutrient levels are at 72%. Consider adjusting nutrient delivery in the next 24 hours.",
+    "growth": "The maize is growing at an optimal rate based on current environmental conditions.",
+    "temperature": "Temperature is maintained at 23.5°C, which is ideal for maize cultivation."
+})
+_DEFAULT_RESPONSE = "I can help you with information about maize health, water levels, nutrients, growth, and temperature. What would you like to know?"
+
+#one alternation over every keyword, matches substrings like the old `in` checks
+_KEY_RE = re.compile('|'.join(map(re.escape, _RESPONSES)), re.I)
+
+@functools.lru_cache(maxsize=1024)
+def _respond(message_lower: str) -> str:
+    """Keyword lookup behind get_rag_response, memoized on the normalized message"""
+    m = _KEY_RE.search(message_lower)
+    return _RESPONSES[m.group(0).lower()] if m else _DEFAULT_RESPONSE
 
 def get_rag_response(user_message: str, context: Optional[Dict[str, Any]] = None) -> str:
-    """Simplified interface for chat responses"""
-    try:
-        #simple response system
-        responses = {
-            "health": "The maize crop is showing good health metrics with optimal pH and humidity levels.",
-            "water": "Current water levels are at 85%, which is within the optimal range for maize growth.",
-            "nutrients": "Nutrient levels are at 72%. Consider adjusting nutrient delivery in the next 24 hours.",
-            "growth": "The maize is growing at an optimal rate based on current environmental conditions.",
-            "temperature": "Temperature is maintained at 23.5°C, which is ideal for maize cultivation."
-        }
-        
-        #check for keywords in user message
-        message = user_message.lower()
-        for key, response in responses.items():
-            if key in message:
-                return response
-        
-        #default response
-        return "I can help you with information about maize health, water levels, nutrients, growth, and temperature. What would you like to know?"
-            
-    except Exception as e:
-        print(f"Error generating response: {str(e)}")
-        return "I apologize, but I'm having trouble processing your request."
+    """Simplified interface for chat responses, context is currently unused"""
+    return _respond(user_message.lower().strip())